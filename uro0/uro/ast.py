@@ -1,34 +1,61 @@
-NODE_STATEMENT = "node_statement"
-NODE_ASSIGNMENT = "node_assignment"
-NODE_IDENTITY = "node_identity"
-NODE_KEY = "node_key"
-NODE_STRING_LITERAL = "node_string_literal"
-NODE_NUMBER_LITERAL = "node_number_literal"
-NODE_FUNCTION_CALL = "node_function_call"
-NODE_FUNCTION = "node_function"
-NODE_ARG = "node_arg"
-NODE_BLOCK = "node_block"
-NODE_RETURN = "node_return"
-NODE_DICTIONARY = "node_dictionary"
-NODE_KEY_VALUE = "node_key_value"
-NODE_IMPORT = "node_import"
-NODE_FOR = "node_for"
-NODE_BOOLEAN = "node_boolean"
-NODE_COMPARISON = "node_comparison"
-NODE_EXTERN = "node_extern"
-NODE_FREE = "node_free"
+import enum
+
+
+class NodeType(enum.IntEnum):
+    STATEMENT = enum.auto()
+    ASSIGNMENT = enum.auto()
+    IDENTITY = enum.auto()
+    KEY = enum.auto()
+    STRING_LITERAL = enum.auto()
+    NUMBER_LITERAL = enum.auto()
+    FUNCTION_CALL = enum.auto()
+    FUNCTION = enum.auto()
+    ARG = enum.auto()
+    BLOCK = enum.auto()
+    RETURN = enum.auto()
+    DICTIONARY = enum.auto()
+    KEY_VALUE = enum.auto()
+    IMPORT = enum.auto()
+    FOR = enum.auto()
+    BOOLEAN = enum.auto()
+    COMPARISON = enum.auto()
+    EXTERN = enum.auto()
+    FREE = enum.auto()
+
+
+NODE_STATEMENT = NodeType.STATEMENT
+NODE_ASSIGNMENT = NodeType.ASSIGNMENT
+NODE_IDENTITY = NodeType.IDENTITY
+NODE_KEY = NodeType.KEY
+NODE_STRING_LITERAL = NodeType.STRING_LITERAL
+NODE_NUMBER_LITERAL = NodeType.NUMBER_LITERAL
+NODE_FUNCTION_CALL = NodeType.FUNCTION_CALL
+NODE_FUNCTION = NodeType.FUNCTION
+NODE_ARG = NodeType.ARG
+NODE_BLOCK = NodeType.BLOCK
+NODE_RETURN = NodeType.RETURN
+NODE_DICTIONARY = NodeType.DICTIONARY
+NODE_KEY_VALUE = NodeType.KEY_VALUE
+NODE_IMPORT = NodeType.IMPORT
+NODE_FOR = NodeType.FOR
+NODE_BOOLEAN = NodeType.BOOLEAN
+NODE_COMPARISON = NodeType.COMPARISON
+NODE_EXTERN = NodeType.EXTERN
+NODE_FREE = NodeType.FREE
 
 
 class Node:
+    __slots__ = ("type", "content")
+
     def __init__(self, node_type, content):
         self.type = node_type
         self.content = content
 
     def __str__(self):
-        return f"{self.type}({self.content})"
+        return f"node_{self.type.name.lower()}({self.content})"
 
     def __repr__(self):
         return str(self)
 
     def __eq__(self, other):
-        return self.type == other
+        return self.type is other
@@ -1,4 +1,7 @@
+import itertools
 import logging
+import re
+from abc import ABC, abstractmethod
 
 from uro.ir import *
 
@@ -30,6 +33,70 @@ These steps are performed in IR_CALL_FUNCTION.
 
 ARCHITECTURE_X86_64_LINUX = "X86_64_LINUX"
 
+REGISTERS_X86_64 = {"rax", "rbx", "rcx", "rdx", "rsi", "rdi", "rbp", "rsp"} | {
+    f"r{n}" for n in range(8, 16)
+}
+
+STACK_OPS_X86_64 = {"push", "pop", "call", "ret", "enter", "leave"}
+EXIT_X86_64 = [("", "push", "0"), ("", "call", "exit")]
+
+LABEL_RE_X86_64 = re.compile(r"[a-z]+_\d{6}")
+INTEGER_RE_X86_64 = re.compile(r"-?\d+")
+
+
+def _is_immediate_x86_64(operand):
+    """Returns True if an operand can be pushed as a (sign-extended) 32-bit immediate.
+
+    Generated labels (e.g. `f_000001`) are immediates as well, since the binary is linked
+    at a fixed address in the lower 2GB.
+    """
+    if LABEL_RE_X86_64.fullmatch(operand):
+        return True
+    return (
+        bool(INTEGER_RE_X86_64.fullmatch(operand))
+        and -(2 ** 31) <= int(operand) < 2 ** 31
+    )
+
+
+def _find_stack_adjustment_x86_64(instrs, operand):
+    """Returns the index of an `add <operand>` which is undone by the final instruction.
+
+    Returns None if any instruction in between carries a label, uses the stack or jumps.
+    """
+    for i in range(len(instrs) - 2, -1, -1):
+        label, op, arg = instrs[i]
+        if op == "add" and arg == operand:
+            return i
+        if label or op in STACK_OPS_X86_64 or op.startswith("j") or "rsp" in arg:
+            return None
+    return None
+
+
+def _format_line(left, middle, right):
+    """Formats a line of assembly code in three columns."""
+    return f"{left:10s} {middle:10s} {right:10s}\n"
+
+
+def _extern_wrapper_x86_64(param_len):
+    """Returns the instructions around the call in a wrapper of an external function.
+
+    The wrapper moves the parameters from the stack into the registers the C calling
+    convention expects them in, and restores those registers afterwards.
+    """
+    registers = ["rdi", "rsi", "rdx", "rcx"][:param_len]
+    prologue = [("", "push", "rbp")]
+    prologue += [("", "push", register) for register in registers]
+    prologue.append(("", "mov", "rbp, rsp"))
+    for i, register in enumerate(registers):
+        prologue.append(("", "mov", f"{register}, [rbp+{16+8*i+8*param_len}]"))
+    epilogue = [("", "mov", "rsp, rbp")]
+    epilogue += [("", "pop", register) for register in reversed(registers)]
+    epilogue += [("", "pop", "rbp"), ("", "ret", "")]
+    return prologue, epilogue
+
+
+EXTERN_WRAPPERS_X86_64 = [_extern_wrapper_x86_64(n) for n in range(5)]
+
 
 class Context:
     def __init__(self, name=None, parent=None):
@@ -38,14 +105,6 @@ class Context:
         self._parent = parent
         self._position = 0
 
-    @property
-    def variables(self):
-        """Returns a shallow merge of this scope's variables and the parent's."""
-        if self._parent:
-            return self.parent.variables | self._variables
-        else:
-            return self._variables
-
     @property
     def child(self):
         """Returns a child-context.
@@ -64,11 +123,14 @@ class Context:
         self._position += delta
 
     def get_position(self, name):
-        """Returns the position of a given variable."""
-        position = self._variables.get(name)
-        if not position:
-            raise ValueError(f"Unknown variable: {name}")
-        return position
+        """Returns the position of a given variable, looking through the parent scopes."""
+        context = self
+        while context is not None:
+            position = context._variables.get(name)
+            if position is not None:
+                return position
+            context = context._parent
+        raise ValueError(f"Unknown variable: {name}")
 
 
 class Generator:
@@ -83,48 +145,45 @@ class Generator:
         return cls._factory(*args, **kwargs)
 
 
-class _Generator:
+class _Generator(ABC):
+    def __init__(self):
+        self._dispatch = [None] * IR_COUNT
+        self._dispatch[IR_MAKE_NUMBER] = self.make_number
+        self._dispatch[IR_EXTERN] = self.extern
+        self._dispatch[IR_SET_NAME] = self.set_name
+        self._dispatch[IR_CALL_FUNCTION] = self.call_function
+        self._dispatch[IR_MAKE_STRING] = self.make_string
+        self._dispatch[IR_PUSH_REFERENCE] = self.push_reference
+        self._dispatch[IR_MAKE_BOOLEAN] = self.make_boolean
+        self._dispatch[IR_MAKE_FUNCTION] = self.make_function
+
     def compile(self, ir):
         """Compile an IR to ASM."""
-        methods = {
-            IR_MAKE_NUMBER: self.make_number,
-            IR_EXTERN: self.extern,
-            IR_SET_NAME: self.set_name,
-            IR_CALL_FUNCTION: self.call_function,
-            IR_MAKE_STRING: self.make_string,
-            IR_PUSH_REFERENCE: self.push_reference,
-            IR_MAKE_BOOLEAN: self.make_boolean,
-        }
+        dispatch = self._dispatch
         for instr, args in ir:
-            if instr != IR_NOP:
-                methods[instr](*args)
-
-    def _next_label(self, prefix):
-        """Generates a new label for a given prefix."""
-        number = self._labels.get(prefix, 1)
-        label = f"{prefix}_{number:06d}"
-        self._labels[prefix] = number + 1
-        return label
+            method = dispatch[instr]
+            if method is not None:
+                method(*args)
 
+    @abstractmethod
     def extern(self, name, param_len):
         """Creates a function object of an external C function."""
-        raise NotImplementedError("Please create a concrete implementation")
 
+    @abstractmethod
     def set_name(self, name):
         """Sets a given name to the current top-of-stack."""
-        raise NotImplementedError("Please create a concrete implementation")
 
+    @abstractmethod
     def make_string(self, value):
         """Creates a string object and pushes a pointer to it to the stack."""
-        raise NotImplementedError("Please create a concrete implementation")
 
+    @abstractmethod
     def make_number(self, value):
         """Creates an integer object and pushes it to the stack."""
-        raise NotImplementedError("Please create a concrete implementation")
 
+    @abstractmethod
     def make_boolean(self, boolean):
         """Creates a boolean object and pushes a pointer to it to the stack."""
-        raise NotImplementedError("Please create a concrete implementation")
 
     def make_dictionary(self, value):
         """Creates a dictionary object and pushes a pointer to it to the stack.
@@ -142,29 +201,30 @@ class _Generator:
         """Adds a key-value pair to an existing dictionary."""
         raise NotImplementedError("Please create a concrete implementation")
 
-    def make_function(self, value):
+    def make_function(self, args, block):
         """Defines a function and pushes a pointer to it to the stack."""
         raise NotImplementedError("Please create a concrete implementation")
 
-    def call_function(self, value):
+    @abstractmethod
+    def call_function(self, name, args):
         """Sets up parameters and calls a function."""
-        raise NotImplementedError("Please create a concrete implementation")
 
     def free_object(self, value):
         """Frees up the memory taken by the object which is referenced."""
         raise NotImplementedError("Please create a concrete implementation")
 
+    @abstractmethod
     def push_reference(self, name):
         """Pushes a given pointer to the stack."""
-        raise NotImplementedError("Please create a concrete implementation")
 
 
 class GeneratorX86_64Linux(_Generator):
     def __init__(self):
+        super().__init__()
         self._global = "main"
         self._extern = []
         self._functions = {
-            self._global: [("", "mov", "rbp, rsp")],
+            self._global: [("", "mov", "rbp, rsp"), ("", "cld", "")],
             "exit": [
                 ("", "mov", "rax, 60"),
                 ("", "mov", "rdi, [rsp+8]"),
@@ -172,38 +232,115 @@ class GeneratorX86_64Linux(_Generator):
             ],
         }
         self._data = {}
-        self._labels = {}
+        self._unflushed_data = []
+        self._flushed = {}
+        self._flushed_extern = 0
+        self._strings = {}
+        self._function_labels = itertools.count(1)
+        self._string_labels = itertools.count(1)
         self._context = Context(self._global)
 
     @property
     def asm(self):
-        """Format the assembly code."""
+        """Format the assembly code.
 
-        def _format_line(left, middle, right):
-            return f"{left:10s} {middle:10s} {right:10s}\n"
+        The exit call which ends the main function is only added to the output, so more
+        IR can still be compiled afterwards."""
+        asm = ["; Generated by uro0 compiler - written by Joris Hartog\n"]
+        asm.append(_format_line("", "global", self._global))
 
-        self._functions[self._global].append(("", "push", "0"))
-        self._functions[self._global].append(("", "call", "exit"))
+        asm.extend(_format_line("", "extern", module) for module in self._extern)
 
-        asm = "; Generated by uro0 compiler - written by Joris Hartog\n"
-        asm += _format_line("", "global", self._global)
+        asm.append(_format_line("", "section", ".text"))
 
-        for module in self._extern:
-            asm += _format_line("", "extern", module)
+        for name, function in self._functions.items():
+            if name == self._global:
+                function = itertools.chain(function, EXIT_X86_64)
+            asm.append(_format_line(f"{name}:", "", ""))
+            asm.extend(_format_line(*line) for line in self._peephole(function))
 
-        asm += _format_line("", "section", ".text")
+        asm.append(_format_line("", "section", ".data"))
+        asm.extend(self._data.values())
 
-        for name, function in self._functions.items():
-            asm += _format_line(f"{name}:", "", "")
-            for line in function:
-                asm += _format_line(*line)
+        return "".join(asm)
 
-        asm += _format_line("", "section", ".data")
-        for name, data in self._data.items():
-            asm += _format_line(f"{name}: ", "", "")
-            asm += _format_line(*data)
+    def flush_asm(self):
+        """Format the assembly code which was generated since the previous flush.
 
-        return asm
+        Only the new externs, instructions and data are optimized and formatted, so the
+        cost of a flush doesn't grow with the program. Every function which gained
+        instructions is shown with its label, followed by just the new instructions."""
+        asm = [
+            _format_line("", "extern", module)
+            for module in self._extern[self._flushed_extern :]
+        ]
+        self._flushed_extern = len(self._extern)
+
+        text = []
+        for name, function in self._functions.items():
+            start = self._flushed.get(name, 0)
+            if start < len(function):
+                text.append(_format_line(f"{name}:", "", ""))
+                text.extend(
+                    _format_line(*line) for line in self._peephole(function[start:])
+                )
+                self._flushed[name] = len(function)
+        if text:
+            asm.append(_format_line("", "section", ".text"))
+            asm.extend(text)
+
+        if self._unflushed_data:
+            asm.append(_format_line("", "section", ".data"))
+            asm.extend(self._unflushed_data)
+            self._unflushed_data = []
+
+        return "".join(asm)
+
+    def _peephole(self, instrs):
+        """Removes redundant stack traffic from a list of instructions.
+
+        Every instruction is appended to the output, after which the tail of the output
+        is rewritten for as long as one of these patterns matches:
+
+            mov rax, <imm>; push rax         →  push <imm>
+            push X; pop X                    →
+            push X; pop Y                    →  mov Y, X
+            add rsp, N; <...>; sub rsp, N    →  <...>
+
+        The last pattern only applies if none of the instructions in between touch the
+        stack or jump. Note that rax is treated as a scratch register, it never outlives
+        a single IR operation. An instruction carrying a label is never merged into the
+        instructions before it, as it might be a branch target.
+        """
+        out = []
+        for instr in instrs:
+            out.append(instr)
+            while len(out) >= 2:
+                (label_a, op_a, arg_a), (label_b, op_b, arg_b) = out[-2:]
+                if label_b:
+                    break
+                elif (
+                    op_a == "mov"
+                    and op_b == "push"
+                    and arg_b == "rax"
+                    and arg_a.startswith("rax, ")
+                    and _is_immediate_x86_64(arg_a[5:])
+                ):
+                    out[-2:] = [(label_a, "push", arg_a[5:])]
+                elif op_a == "push" and op_b == "pop" and arg_a == arg_b:
+                    out[-2:] = [(label_a, "", "")] if label_a else []
+                elif op_a == "push" and op_b == "pop" and arg_b in REGISTERS_X86_64:
+                    out[-2:] = [(label_a, "mov", f"{arg_b}, {arg_a}")]
+                elif op_b == "sub" and arg_b.startswith("rsp, "):
+                    i = _find_stack_adjustment_x86_64(out, arg_b)
+                    if i is None:
+                        break
+                    label = out[i][0]
+                    out.pop()
+                    out[i : i + 1] = [(label, "", "")] if label else []
+                else:
+                    break
+        return out
 
     def extern(self, name, param_len):
         """Creates a function object of an external C function."""
@@ -213,45 +350,14 @@ class GeneratorX86_64Linux(_Generator):
             # Already implemented this function
             return None
 
-        label = self._next_label("f")
+        function = self._functions[self._context.name]
+        label = f"f_{next(self._function_labels):06d}"
         self._extern.append(name)
-        self._functions[self._context.name].append(("", "mov", f"rax, {label}"))
-        self._functions[self._context.name].append(("", "push", "rax"))
-
-        self._functions[label] = [("", "push", "rbp")]
-        if param_len > 0:
-            self._functions[label].append(("", "push", "rdi"))
-        if param_len > 1:
-            self._functions[label].append(("", "push", "rsi"))
-        if param_len > 2:
-            self._functions[label].append(("", "push", "rdx"))
-        if param_len > 3:
-            self._functions[label].append(("", "push", "rcx"))
-
-        self._functions[label].append(("", "mov", "rbp, rsp"))
-
-        if param_len > 0:
-            self._functions[label].append(("", "mov", f"rdi, [rbp+{16+8*param_len}]"))
-        if param_len > 1:
-            self._functions[label].append(("", "mov", f"rsi, [rbp+{24+8*param_len}]"))
-        if param_len > 2:
-            self._functions[label].append(("", "mov", f"rdx, [rbp+{32+8*param_len}]"))
-        if param_len > 3:
-            self._functions[label].append(("", "mov", f"rcx, [rbp+{40+8*param_len}]"))
-
-        self._functions[label].append(("", "call", name))
-        self._functions[label].append(("", "mov", "rsp, rbp"))
-        if param_len > 3:
-            self._functions[label].append(("", "pop", "rcx"))
-        if param_len > 2:
-            self._functions[label].append(("", "pop", "rdx"))
-        if param_len > 1:
-            self._functions[label].append(("", "pop", "rsi"))
-        if param_len > 0:
-            self._functions[label].append(("", "pop", "rdi"))
-
-        self._functions[label].append(("", "pop", "rbp"))
-        self._functions[label].append(("", "ret", ""))
+        function.append(("", "mov", f"rax, {label}"))
+        function.append(("", "push", "rax"))
+
+        prologue, epilogue = EXTERN_WRAPPERS_X86_64[param_len]
+        self._functions[label] = [*prologue, ("", "call", name), *epilogue]
 
         self._context.move_stack_pointer()
 
@@ -262,13 +368,14 @@ class GeneratorX86_64Linux(_Generator):
     def call_function(self, name, args):
         """Sets up parameters and calls a function."""
         self.compile(args)
+        function = self._functions[self._context.name]
         position = self._context.get_position(name)
         arg_len = len(args)
         assert position <= 0
-        self._functions[self._context.name].append(("", "call", f"[rbp-{-position}]"))
-        self._functions[self._context.name].append(("", "add", f"rsp, {8*arg_len}"))
-        self._functions[self._context.name].append(("", "push", "rax"))
-        self._context.move_stack_pointer(8*arg_len)
+        function.append(("", "call", f"[rbp-{-position}]"))
+        function.append(("", "add", f"rsp, {8*arg_len}"))
+        function.append(("", "push", "rax"))
+        self._context.move_stack_pointer(8 * arg_len)
 
     def make_string(self, value):
         """Creates a string object and pushes a pointer to it to the stack."""
@@ -277,28 +384,22 @@ class GeneratorX86_64Linux(_Generator):
         self.extern("malloc", 1)
         self.set_name("malloc")
         self.make_number(string_length)
-        self.call_function("malloc", [(IR_NOP, ())])
-
-        string_label = self._next_label("s")
-        start_label = self._next_label("l")
-        end_label = self._next_label("e")
-
-        self._data[string_label] = ("", "db", f'"{value}", 0')
-
-        self._functions[self._context.name].append(("", "mov", f"rdi, {string_label}"))
-        self._functions[self._context.name].append(("", "mov", f"rcx, {string_length}"))
-        self._functions[self._context.name].append(("", "xor", "rbx, rbx"))
-        self._functions[self._context.name].append(
-            (f"{start_label}:", "mov", "bl, byte [rdi]")
-        )
-        self._functions[self._context.name].append(("", "mov", "byte [rax], bl"))
-        self._functions[self._context.name].append(("", "inc", "rax"))
-        self._functions[self._context.name].append(("", "inc", "rdi"))
-        self._functions[self._context.name].append(("", "dec", "rcx"))
-        self._functions[self._context.name].append(("", "cmp", "rcx, byte 0"))
-        self._functions[self._context.name].append(("", "je", end_label))
-        self._functions[self._context.name].append(("", "jmp", start_label))
-        self._functions[self._context.name].append((f"{end_label}:", "", ""))
+        self.call_function("malloc", [IR_NOP_INSTRUCTION])
+
+        function = self._functions[self._context.name]
+        string_label = self._strings.get(value)
+        if string_label is None:
+            string_label = f"s_{next(self._string_labels):06d}"
+            self._strings[value] = string_label
+            data = _format_line("", "db", f'"{value}", 0')
+            data = _format_line(f"{string_label}: ", "", "") + data
+            self._data[string_label] = data
+            self._unflushed_data.append(data)
+
+        function.append(("", "mov", f"rsi, {string_label}"))
+        function.append(("", "mov", "rdi, rax"))
+        function.append(("", "mov", f"rcx, {string_length}"))
+        function.append(("", "rep", "movsb"))
         self._context.move_stack_pointer()
 
     def make_number(self, value):
@@ -311,9 +412,8 @@ class GeneratorX86_64Linux(_Generator):
         position = self._context.get_position(name)
         assert position <= 0
         self._functions[self._context.name].append(
-            ("", "mov", f"rax, [rbp-{-position}]")
+            ("", "push", f"qword [rbp-{-position}]")
         )
-        self._functions[self._context.name].append(("", "push", "rax"))
         self._context.move_stack_pointer()
 
     def make_boolean(self, boolean):
@@ -1,17 +1,21 @@
 import logging
 
 from uro.ast import *
+from uro.tokens import *
 
 
-IR_SET_NAME = "ir_set_name"
-IR_PUSH_REFERENCE = "ir_push_reference"
-IR_MAKE_STRING = "ir_make_string"
-IR_MAKE_NUMBER = "ir_make_number"
-IR_MAKE_BOOLEAN = "ir_make_boolean"
-IR_MAKE_FUNCTION = "ir_make_function"
-IR_CALL_FUNCTION = "ir_call_function"
-IR_EXTERN = "ir_extern"
-IR_NOP = "ir_nop"
+IR_SET_NAME = 0
+IR_PUSH_REFERENCE = 1
+IR_MAKE_STRING = 2
+IR_MAKE_NUMBER = 3
+IR_MAKE_BOOLEAN = 4
+IR_MAKE_FUNCTION = 5
+IR_CALL_FUNCTION = 6
+IR_EXTERN = 7
+IR_NOP = 8
+IR_COUNT = 9
+
+IR_NOP_INSTRUCTION = (IR_NOP, ())
 
 
 def _remove_quotes(s):
@@ -22,29 +26,40 @@ def _remove_quotes(s):
 class IRGenerator:
     """Turns an AST into an intermediate representation (IR).
 
-    The IR is formatted as a list of `(op, args)` tuples.
+    The IR is generated lazily as a stream of `(op, args)` tuples, so the code generator
+    can consume each instruction as soon as it is produced.
     """
 
     def __init__(self, ast):
         self.ast = ast
+        self._debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        self._expression_generators = {
+            NODE_IDENTITY: self._generate_identity,
+            NODE_STRING_LITERAL: self._generate_string_literal,
+            NODE_NUMBER_LITERAL: self._generate_number_literal,
+            NODE_BOOLEAN: self._generate_boolean,
+            NODE_FUNCTION: self._generate_function,
+            NODE_FUNCTION_CALL: self._generate_function_call,
+            NODE_EXTERN: self._generate_extern,
+        }
 
     @property
     def ir(self):
-        """Returns the IR."""
-        ir = self._generate_program(self.ast)
-        logging.debug(ir)
-        return ir
+        """Returns an iterator over the IR."""
+        for instruction in self._generate_program(self.ast):
+            if self._debug:
+                logging.debug("%s", instruction)
+            yield instruction
 
     def _generate_program(self, root):
-        logging.debug("%s", root)
-        ir = []
+        if self._debug:
+            logging.debug("%s", root)
         for node in root:
-            statement_ir = self._generate_statement(node)
-            ir.extend(statement_ir)
-        return ir
+            yield from self._generate_statement(node)
 
     def _generate_statement(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         statement = node.content
         if statement == NODE_ASSIGNMENT:
             return self._generate_assignment(statement)
@@ -54,83 +69,73 @@ class IRGenerator:
             return self._generate_expression(statement)
 
     def _generate_assignment(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         identity_node, expression_node = node.content
         identity_token, keys_tokens = identity_node
 
-        ir_expression = self._generate_expression(expression_node)
         if keys_tokens:
             raise NotImplementedError
         else:
-            ir_identity = (IR_SET_NAME, (identity_token.value,))
-            return ir_expression + [ir_identity]
+            yield from self._generate_expression(expression_node)
+            yield (IR_SET_NAME, (identity_token.value,))
 
     def _generate_expression(self, node):
-        logging.debug("%s", node)
-        if node == NODE_IDENTITY:
-            return self._generate_identity(node)
-        elif node == NODE_STRING_LITERAL:
-            return self._generate_string_literal(node)
-        elif node == NODE_NUMBER_LITERAL:
-            return self._generate_number_literal(node)
-        elif node == NODE_BOOLEAN:
-            return self._generate_boolean(node)
-        elif node == NODE_FUNCTION:
-            return self._generate_function(node)
-        elif node == NODE_FUNCTION_CALL:
-            return self._generate_function_call(node)
-        elif node == NODE_EXTERN:
-            return self._generate_extern(node)
-        raise NotImplementedError
+        if self._debug:
+            logging.debug("%s", node)
+        generator = self._expression_generators.get(node.type)
+        if generator is None:
+            raise NotImplementedError
+        return generator(node)
 
     def _generate_identity(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         identity_token, keys_tokens = node.content[0]
         if keys_tokens:
             raise NotImplementedError
         else:
-            ir_identity = (IR_PUSH_REFERENCE, identity_token.value)
-            return [ir_identity]
+            yield (IR_PUSH_REFERENCE, identity_token.value)
 
     def _generate_string_literal(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         string = _remove_quotes(node.content.value)
-        ir_string = (IR_MAKE_STRING, (string,))
-        return [ir_string]
+        yield (IR_MAKE_STRING, (string,))
 
     def _generate_number_literal(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         number = int(node.content.value)
-        ir_number = (IR_MAKE_NUMBER, (number,))
-        return [ir_number]
+        yield (IR_MAKE_NUMBER, (number,))
 
     def _generate_boolean(self, node):
-        logging.debug("%s", node)
-        boolean = node.content.value == "True"
-        ir_boolean = (IR_MAKE_BOOLEAN, (boolean,))
-        return [ir_boolean]
+        if self._debug:
+            logging.debug("%s", node)
+        boolean = node.content.type is TOKEN_KW_TRUE
+        yield (IR_MAKE_BOOLEAN, (boolean,))
 
     def _generate_function(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         args_node, block_node = node.content
         assert all(arg.content == NODE_IDENTITY for arg in args_node)
         args = [name.value for arg in args_node for name, _ in arg.content.content]
-        block = self._generate_program(block_node.content)
-        ir_function = (IR_MAKE_FUNCTION, (args, block))
-        return [ir_function]
+        block = list(self._generate_program(block_node.content))
+        yield (IR_MAKE_FUNCTION, (args, block))
 
     def _generate_extern(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         name_token, arg_len_token = node.content
         name = _remove_quotes(name_token.value)
         arg_len = int(arg_len_token.value)
-        ir_extern = (IR_EXTERN, (name, arg_len))
-        return [ir_extern]
+        yield (IR_EXTERN, (name, arg_len))
 
     def _generate_function_call(self, node):
-        logging.debug("%s", node)
+        if self._debug:
+            logging.debug("%s", node)
         identifier_node, args_node = node.content
         name = identifier_node[0].value
         args = [ir for a in args_node for ir in self._generate_expression(a.content)]
-        ir_function_call = (IR_CALL_FUNCTION, (name, args))
-        return [ir_function_call]
+        yield (IR_CALL_FUNCTION, (name, args))
@@ -1,5 +1,6 @@
 import logging
-import re
+import string
+import sys
 
 from uro.tokens import *
 
@@ -8,29 +9,125 @@ class LexerError(Exception):
     pass
 
 
+_IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+_INTERNED_TYPES = frozenset({TOKEN_IDENTIFIER, *KEYWORDS.values()})
+
+
+def _scan_pattern(s, pos):
+    """Matches a token using the master regex and returns its type and end position.
+
+    This is the fallback for characters which have no dedicated scanner. Anything the
+    regex doesn't match either is returned as an unknown token up to the end of the line.
+    """
+    match = MASTER_RE.match(s, pos)
+    if match:
+        return (
+            KEYWORDS.get(match.group(0), MASTER_RE_TYPES[match.lastindex]),
+            match.end(),
+        )
+    end = s.find("\n", pos)
+    return TOKEN_UNKNOWN, len(s) if end == -1 else end
+
+
+def _scan_whitespace(s, pos):
+    end = pos + 1
+    n = len(s)
+    while end < n and s[end].isspace():
+        end += 1
+    return TOKEN_WHITESPACE, end
+
+
+def _scan_number(s, pos):
+    end = pos + 1
+    n = len(s)
+    while end < n and s[end].isdecimal():
+        end += 1
+    return TOKEN_NUMBER, end
+
+
+def _scan_identifier(s, pos):
+    end = pos + 1
+    n = len(s)
+    while end < n and s[end] in _IDENTIFIER_CHARS:
+        end += 1
+    return KEYWORDS.get(s[pos:end], TOKEN_IDENTIFIER), end
+
+
+def _scan_comment(s, pos):
+    end = s.find("\n", pos)
+    return TOKEN_COMMENT, len(s) if end == -1 else end
+
+
+def _scan_string(s, pos):
+    end = s.find(s[pos], pos + 1)
+    if end == -1 or s.find("\n", pos, end) != -1:
+        return _scan_pattern(s, pos)
+    return TOKEN_STRING, end + 1
+
+
+def _scan_assign(s, pos):
+    if s.startswith("==", pos):
+        return TOKEN_EQUAL, pos + 2
+    return TOKEN_ASSIGN, pos + 1
+
+
+def _build_scanners():
+    """Returns a dict which maps the first character of a token to its scanner.
+
+    The scanners mirror PATTERNS, but skip the regex engine for the common cases.
+    Single-character punctuators don't need a scanner, as tokenize looks them up in
+    PUNCTUATORS first. Other characters without a scanner are matched by the master
+    regex instead.
+    """
+    scanners = {}
+    for char in string.whitespace:
+        scanners[char] = _scan_whitespace
+    for char in string.digits:
+        scanners[char] = _scan_number
+    for char in string.ascii_letters + "_":
+        scanners[char] = _scan_identifier
+    scanners["#"] = _scan_comment
+    scanners["'"] = _scan_string
+    scanners['"'] = _scan_string
+    scanners["="] = _scan_assign
+    return scanners
+
+
+_SCANNERS = _build_scanners()
+
+
 def tokenize(code):
-    """Tokenize code."""
-
-    def _find_token(s):
-        for rule, token_type in PATTERNS:
-            match = re.match(rule, s)
-            if match:
-                token_value = match.group(0)
-                if token_value in KEYWORDS:
-                    return TOKEN_KEYWORD, token_value
-                else:
-                    return token_type, token_value
-        return TOKEN_UNKNOWN, s
+    """Tokenize code.
 
+    Whitespace and comments are skipped without creating a token, or even slicing them
+    out of the code. The values of identifiers and keywords are interned, as the same
+    names recur throughout a program and end up as keys of the generator's tables."""
     tokens = []
+    line_number = 1
+    pos = 0
+
+    # Bound to locals, as they're looked up for every token.
+    n = len(code)
+    punctuators_get = PUNCTUATORS.get
+    scanners_get = _SCANNERS.get
+    tokens_append = tokens.append
 
-    for line_number, line in enumerate(code.split("\n")):
-        while line:
-            token_type, token_value = _find_token(line)
-            if token_type not in {TOKEN_WHITESPACE, TOKEN_COMMENT}:
-                token = Token(token_type, token_value, line_number + 1)
-                logging.debug("Found token: %s", token)
-                tokens.append(token)
-            line = line[len(token_value) :]
+    while pos < n:
+        char = code[pos]
+        token_type = punctuators_get(char)
+        if token_type is not None:
+            end = pos + 1
+        else:
+            token_type, end = scanners_get(char, _scan_pattern)(code, pos)
+        if token_type is TOKEN_WHITESPACE:
+            line_number += code.count("\n", pos, end)
+        elif token_type is not TOKEN_COMMENT:
+            token_value = code[pos:end]
+            if token_type in _INTERNED_TYPES:
+                token_value = sys.intern(token_value)
+            token = Token(token_type, token_value, line_number)
+            logging.debug("Found token: %s", token)
+            tokens_append(token)
+        pos = end
 
     return tokens
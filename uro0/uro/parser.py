@@ -1,3 +1,4 @@
+import gc
 import logging
 
 from uro.ast import *
@@ -21,19 +22,22 @@ return_cont → ε
 keys → key keys
 keys → ε
 key → LSTRAIGHTBRACKET expression RSTRAIGHTBRACKET
-expression → STRING comparison_cont
-expression → NUMBER comparison_cont
-expression → LBRACKET expression RBRACKET comparison_cont
-expression → function comparison_cont
-expression → dictionary comparison_cont
-expression → boolean comparison_cont
-expression → identity assignment_or_identity_or_function_call comparison_cont
+expression → operand comparisons
 expression → extern
 extern → KEYWORD<extern> LBRACKET STRING COMMA NUMBER RBRACKET
-comparison_cont → EQUAL expression comparison_cont
-comparison_cont → GREATERTHAN expression comparison_cont
-comparison_cont → LESSTHAN expression comparison_cont
-comparison_cont → ε
+comparisons → EQUAL comparand comparisons
+comparisons → GREATERTHAN comparand comparisons
+comparisons → LESSTHAN comparand comparisons
+comparisons → ε
+comparand → operand
+comparand → extern
+operand → STRING
+operand → NUMBER
+operand → LBRACKET expression RBRACKET
+operand → function
+operand → dictionary
+operand → boolean
+operand → identity assignment_or_identity_or_function_call
 boolean → KEYWORD<True>
 boolean → KEYWORD<False>
 identity → IDENTIFIER keys
@@ -60,9 +64,83 @@ arg → expression
 """
 
 
+_EXPRESSION_FIRST = frozenset(
+    {
+        TOKEN_IDENTIFIER,
+        TOKEN_STRING,
+        TOKEN_NUMBER,
+        TOKEN_LBRACKET,
+        TOKEN_LCURLYBRACKET,
+        TOKEN_KW_FN,
+        TOKEN_KW_TRUE,
+        TOKEN_KW_FALSE,
+    }
+)
+_STATEMENTS_FIRST = _EXPRESSION_FIRST | {
+    TOKEN_KW_RETURN,
+    TOKEN_KW_IMPORT,
+    TOKEN_KW_FOR,
+    TOKEN_KW_EXTERN,
+    TOKEN_KW_FREE,
+}
+_STATEMENTS_FOLLOW = frozenset({TOKEN_EOF, TOKEN_RCURLYBRACKET})
+_BOOLEANS = frozenset({TOKEN_KW_TRUE, TOKEN_KW_FALSE})
+_KEYS_FOLLOW = frozenset(
+    {
+        TOKEN_SEMICOLON,
+        TOKEN_ASSIGN,
+        TOKEN_RBRACKET,
+        TOKEN_RSTRAIGHTBRACKET,
+        TOKEN_LBRACKET,
+        TOKEN_COMMA,
+        TOKEN_COLON,
+        TOKEN_LCURLYBRACKET,
+        TOKEN_RCURLYBRACKET,
+        TOKEN_EQUAL,
+        TOKEN_GREATERTHAN,
+        TOKEN_LESSTHAN,
+        TOKEN_KW_IN,
+    }
+)
+_IDENTITY_FOLLOW = frozenset(
+    {
+        TOKEN_ASSIGN,
+        TOKEN_RBRACKET,
+        TOKEN_RSTRAIGHTBRACKET,
+        TOKEN_COMMA,
+        TOKEN_SEMICOLON,
+        TOKEN_COLON,
+        TOKEN_RCURLYBRACKET,
+        TOKEN_EQUAL,
+        TOKEN_GREATERTHAN,
+        TOKEN_LESSTHAN,
+    }
+)
+_COMPARISON_FOLLOW = frozenset(
+    {
+        TOKEN_ASSIGN,
+        TOKEN_RBRACKET,
+        TOKEN_RSTRAIGHTBRACKET,
+        TOKEN_COMMA,
+        TOKEN_SEMICOLON,
+        TOKEN_COLON,
+        TOKEN_RCURLYBRACKET,
+    }
+)
+_COMPARISON_OPERATORS = frozenset({TOKEN_EQUAL, TOKEN_GREATERTHAN, TOKEN_LESSTHAN})
+
+
+def _dispatch_table(handlers):
+    """Returns a list which maps every token type to its handler, or None."""
+    table = [None] * TOKEN_COUNT
+    for token_type, handler in handlers.items():
+        table[token_type] = handler
+    return table
+
+
 class ParseError(Exception):
     def __init__(self, token):
-        if token == TOKEN_EOF:
+        if token.type is TOKEN_EOF:
             raise UnexpectedEOF()
         msg = f"Syntax error at line {token.line}: '{token.value}'"
         super().__init__(msg)
@@ -72,18 +150,87 @@ class UnexpectedEOF(Exception):
     pass
 
 
+class TokenStream:
+    """A cursor over a list of tokens.
+
+    The parser reads tokens by moving the cursor, rather than popping them off the front
+    of the list. Reading past the last token yields the given EOF token, so the list
+    doesn't need to be copied to append one. The current token and its type are kept at
+    hand, as most productions look at the type several times before consuming the token.
+    """
+
+    __slots__ = ("tokens", "pos", "eof", "current", "type", "debug")
+
+    def __init__(self, tokens, eof, pos=0):
+        self.tokens = tokens
+        self.pos = pos
+        self.eof = eof
+        self.current = tokens[pos] if pos < len(tokens) else eof
+        self.type = self.current.type
+        self.debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    def peek(self):
+        """Returns the current token without consuming it, or the EOF token at the end."""
+        return self.current
+
+    def advance(self):
+        """Consumes and returns the current token, or the EOF token at the end."""
+        token = self.current
+        self.pos += 1
+        try:
+            self.current = self.tokens[self.pos]
+        except IndexError:
+            self.current = self.eof
+        self.type = self.current.type
+        return token
+
+    def at_eof(self):
+        """Returns True if all tokens have been consumed."""
+        return self.pos >= len(self.tokens)
+
+    def expect(self, token_type):
+        """Consumes the current token and raises a ParseError if it has another type."""
+        token = self.advance()
+        if token.type is not token_type:
+            raise ParseError(token)
+        return token
+
+
 class Parser:
     def __init__(self):
         self._tokens = []
+        self._statements = []
+        self._checkpoint = 0
         self.ast = []
 
     def add_tokens(self, tokens):
-        """Add a list of tokens to the buffer."""
+        """Add a list of tokens to the buffer.
+
+        The buffer is a plain list, as the parser reads it through a TokenStream cursor
+        and never pops tokens off its front."""
         self._tokens.extend(tokens)
 
     def reset(self):
-        """Empty the token buffer."""
+        """Empty the token buffer and forget any partially parsed program."""
         self._tokens = []
+        self._statements = []
+        self._checkpoint = 0
+
+    @property
+    def pending(self):
+        """Returns True if the buffer holds tokens of a program which isn't complete yet."""
+        return bool(self._tokens)
+
+    def incomplete(self, tokens):
+        """Returns True if the tokens can't complete a statement, without parsing them.
+
+        Every statement ends with a semicolon, so a single token which can start a
+        statement is known to be incomplete if no other tokens are buffered."""
+        return (
+            not self._tokens
+            and len(tokens) == 1
+            and _STATEMENT_DISPATCH[tokens[0].type] is not None
+        )
 
     @property
     def line_range(self):
@@ -95,42 +242,57 @@ class Parser:
     def parse(self):
         """Parse the buffered tokens and return True if parsed successfully.
 
-        Note that the boolean which is returned only exists to verify the parser itself;
-        the parser should always raise a ParseError when a syntax error is detected."""
-        tokens = self._tokens + [Token(TOKEN_EOF, TOKEN_EOF, self.line_range[1])]
-        ast = Parser.parse_program(tokens)
-        if tokens.pop() == TOKEN_EOF:
-            self.ast = ast
-            self.reset()
-            return True
-        return False
-
-    @classmethod
-    def parse_program(cls, tokens):
+        A ParseError is raised when a syntax error is detected, which includes tokens left
+        over after the program, such as an unmatched closing bracket.
+
+        The cyclic garbage collector is paused while parsing, as every node created is
+        kept in the AST and collecting would only rescan them."""
+        ts = TokenStream(
+            self._tokens, Token(TOKEN_EOF, "$", self.line_range[1]), self._checkpoint
+        )
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            ast = self._parse_program(ts)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not ts.at_eof():
+            raise ParseError(ts.peek())
+        self.ast = ast
+        self.reset()
+        return True
+
+    def _parse_program(self, ts):
         """Parses a 'program' symbol and returns an AST.
 
+        The top-level statements are parsed here rather than by parse_statements, so
+        that a program which is still incomplete can be resumed. When a statement runs
+        into the end of the tokens, as happens when it spans several REPL lines, the
+        statements before it are kept along with the position after them. The next call
+        to parse() continues from there instead of parsing them again.
+
         program → statements
         * first: IDENTIFIER, STRING, NUMBER, LBRACKET, LCURLYBRACKET, KEYWORD<return>,
                  KEYWORD<import>, KEYWORD<fn>, KEYWORD<True>, KEYWORD<False>,
                  KEYWORD<extern>, KEYWORD<free>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_IDENTIFIER,
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD
-            and tokens[0].value
-            in {"return", "import", "fn", "for", "True", "False", "extern", "free"}
-        ):
-            return cls.parse_statements(tokens)
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        statements = self._statements
+        if not statements and ts.type not in _STATEMENTS_FIRST:
+            raise ParseError(ts.peek())
+        while ts.type in _STATEMENTS_FIRST:
+            statement = Parser.parse_statement(ts)
+            semicolon = ts.expect(TOKEN_SEMICOLON)
+            statements.append(Node(NODE_STATEMENT, statement))
+            self._checkpoint = ts.pos
+        if ts.type in _STATEMENTS_FOLLOW:
+            return statements
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_statements(cls, tokens):
+    def parse_statements(cls, ts):
         """Parses a 'statements' symbol and returns an AST.
 
         statements → statement SEMICOLON statements
@@ -140,30 +302,20 @@ class Parser:
         statements → ε
         * follow: $ RCURLYBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_IDENTIFIER,
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD
-            and tokens[0].value
-            in {"return", "import", "fn", "for", "True", "False", "extern", "free"}
-        ):
-            statement = cls.parse_statement(tokens)
-            semicolon = tokens.pop(0)
-            if semicolon != TOKEN_SEMICOLON:
-                raise ParseError(semicolon)
-            statements = cls.parse_statements(tokens)
-            return [Node(NODE_STATEMENT, statement)] + statements
-        elif tokens[0] in {TOKEN_EOF, TOKEN_RCURLYBRACKET}:
-            return []
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        parse_statement = cls.parse_statement
+        statements = []
+        while ts.type in _STATEMENTS_FIRST:
+            statement = parse_statement(ts)
+            semicolon = ts.expect(TOKEN_SEMICOLON)
+            statements.append(Node(NODE_STATEMENT, statement))
+        if ts.type in _STATEMENTS_FOLLOW:
+            return statements
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_statement(cls, tokens):
+    def parse_statement(cls, ts):
         """Parses a 'statement' symbol and returns an AST.
 
         statement → expression
@@ -171,7 +323,8 @@ class Parser:
                  KEYWORD<True>, KEYWORD<False>
         statement → for
         * first: KEYWORD<for>
-        statement → KEYWORD<return> return_cont
+        statement → return
+        * first: KEYWORD<return>
         statement → import
         * first: KEYWORD<import>
         statement → extern
@@ -179,192 +332,118 @@ class Parser:
         statement → free
         * first: KEYWORD<free>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            return cls.parse_expression(tokens)
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "for":
-            return cls.parse_for(tokens)
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "return":
-            keyword = tokens.pop(0)
-            return cls.parse_return_cont(tokens)
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "import":
-            return cls.parse_import(tokens)
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "free":
-            return cls.parse_free(tokens)
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        handler = _STATEMENT_DISPATCH[ts.type]
+        if handler is None:
+            raise ParseError(ts.peek())
+        return handler(ts)
 
     @classmethod
-    def parse_extern(cls, tokens):
+    def parse_return(cls, ts):
+        """Parses a 'return' statement and returns an AST.
+
+        return → KEYWORD<return> return_cont
+        return_cont → expression
+        * first: STRING, NUMBER, LBRACKET, IDENTIFIER, LCURLYBRACKET, KEYWORD<fn>,
+                 KEYWORD<True>, KEYWORD<False>
+        return_cont → ε
+        * follow: SEMICOLON
+        """
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        keyword = ts.advance()
+        if ts.type in _EXPRESSION_FIRST:
+            expression = cls.parse_expression(ts)
+            return Node(NODE_RETURN, expression)
+        elif ts.type is TOKEN_SEMICOLON:
+            return Node(NODE_RETURN, [])
+        raise ParseError(ts.peek())
+
+    @classmethod
+    def parse_extern(cls, ts):
         """Parses an 'extern' node and returns an AST.
 
         extern → KEYWORD<extern> LBRACKET STRING COMMA  RBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value == "extern":
-            extern = tokens.pop(0)
-            lbracket = tokens.pop(0)
-            if lbracket != TOKEN_LBRACKET:
-                raise ParseError(lbracket)
-            string = tokens.pop(0)
-            if string != TOKEN_STRING:
-                raise ParseError(string)
-            comma = tokens.pop(0)
-            if comma != TOKEN_COMMA:
-                raise ParseError(string)
-            number = tokens.pop(0)
-            if number != TOKEN_NUMBER:
-                raise ParseError(number)
-            rbracket = tokens.pop(0)
-            if rbracket != TOKEN_RBRACKET:
-                raise ParseError(rbracket)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_KW_EXTERN:
+            extern = ts.advance()
+            lbracket = ts.expect(TOKEN_LBRACKET)
+            string = ts.expect(TOKEN_STRING)
+            comma = ts.expect(TOKEN_COMMA)
+            number = ts.expect(TOKEN_NUMBER)
+            rbracket = ts.expect(TOKEN_RBRACKET)
             return Node(NODE_EXTERN, (string, number))
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_free(cls, tokens):
+    def parse_free(cls, ts):
         """Parses a 'free' node and returns an AST.
 
         free → KEYWORD<free> LBRACKET identity RBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value == "free":
-            free = tokens.pop(0)
-            lbracket = tokens.pop(0)
-            if lbracket != TOKEN_LBRACKET:
-                raise ParseError(lbracket)
-            identity = cls.parse_identity(tokens)
-            rbracket = tokens.pop(0)
-            if rbracket != TOKEN_RBRACKET:
-                raise ParseError(rbracket)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_KW_FREE:
+            free = ts.advance()
+            lbracket = ts.expect(TOKEN_LBRACKET)
+            identity = cls.parse_identity(ts)
+            rbracket = ts.expect(TOKEN_RBRACKET)
             return Node(NODE_FREE, identity)
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_import(cls, tokens):
+    def parse_import(cls, ts):
         """Parses an 'import' node and returns an AST.
 
         return → KEYWORD<import> STRING
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value == "import":
-            keyword = tokens.pop(0)
-            module = tokens.pop(0)
-            if module != TOKEN_STRING:
-                raise ParseError(module)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_KW_IMPORT:
+            keyword = ts.advance()
+            module = ts.expect(TOKEN_STRING)
             return Node(NODE_IMPORT, module)
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_for(cls, tokens):
+    def parse_for(cls, ts):
         """Parses a 'for' node and returns an AST.
 
         for → KEYWORD<for> identity KEYWORD<in> identity block
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value == "for":
-            keyword_for = tokens.pop(0)
-            obj = cls.parse_identity(tokens)
-            keyword_in = tokens.pop(0)
-            if keyword_in != TOKEN_KEYWORD or keyword_in.value != "in":
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_KW_FOR:
+            keyword_for = ts.advance()
+            obj = cls.parse_identity(ts)
+            keyword_in = ts.advance()
+            if keyword_in.type is not TOKEN_KW_IN:
                 raise ParseError(keyword_in)
-            iterable = cls.parse_identity(tokens)
-            block = cls.parse_block(tokens)
+            iterable = cls.parse_identity(ts)
+            block = cls.parse_block(ts)
             return Node(NODE_FOR, [obj, iterable, block])
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_return_cont(cls, tokens):
-        """Parses a 'return_cont' node and returns an AST.
-
-        return → expression
-        * first: STRING, NUMBER, LBRACKET, IDENTIFIER, LCURLYBRACKET, KEYWORD<fn>,
-                 KEYWORD<True>, KEYWORD<False>
-        return → ε
-        * follow: SEMICOLON
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            expression = cls.parse_expression(tokens)
-            return Node(NODE_RETURN, expression)
-        elif tokens[0] == TOKEN_SEMICOLON:
-            return Node(NODE_RETURN, [])
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_assignment_or_identity_or_function_call(cls, tokens):
-        """Parses an 'assignment'/'identity'/'function_call' node and returns an AST.
-
-        assignment_or_identity_or_function_call → assignment_cont
-        * first: ASSIGN
-        assignment_or_identity_or_function_call → identity_or_function_call
-        * first: LBRACKET
-        * follow: RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON, RCURLYBRACKET,
-                  EQUAL, GREATERTHAN, LESSTHAN
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_ASSIGN:
-            return cls.parse_assignment_cont(tokens)
-        elif tokens[0] in {
-            TOKEN_LBRACKET,
-            TOKEN_RBRACKET,
-            TOKEN_RSTRAIGHTBRACKET,
-            TOKEN_COMMA,
-            TOKEN_SEMICOLON,
-            TOKEN_COLON,
-            TOKEN_RCURLYBRACKET,
-            TOKEN_EQUAL,
-            TOKEN_GREATERTHAN,
-            TOKEN_LESSTHAN,
-        }:
-            return cls.parse_identity_or_function_call(tokens)
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_assignment_cont(cls, tokens):
-        """Parses an 'assignment_cont' node and returns an AST.
-
-        assignment_cont → ASSIGN expression
-        * first: ASSIGN
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_ASSIGN:
-            assign = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            return Node(NODE_ASSIGNMENT, [expression])
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_identity(cls, tokens):
+    def parse_identity(cls, ts):
         """Parses an 'identity' symbol and returns an AST.
 
         identity → IDENTIFIER keys
         * first: IDENTIFIER
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_IDENTIFIER:
-            identifier = tokens.pop(0)
-            keys = cls.parse_keys(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_IDENTIFIER:
+            identifier = ts.advance()
+            keys = cls.parse_keys(ts)
             return Node(NODE_IDENTITY, [identifier, keys])
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_keys(cls, tokens):
+    def parse_keys(cls, ts):
         """Parses a 'keys' symbol and returns an AST.
 
         keys → key keys
@@ -374,197 +453,172 @@ class Parser:
                   LCURLYBRACKET, RCURLYBRACKET, KEYWORD<in>, EQUAL, GREATERTHAN,
                   LESSTHAN
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LSTRAIGHTBRACKET:
-            key = cls.parse_key(tokens)
-            keys = cls.parse_keys(tokens)
-            return [Node(NODE_KEY, key)] + keys
-        elif (
-            tokens[0]
-            in {
-                TOKEN_SEMICOLON,
-                TOKEN_ASSIGN,
-                TOKEN_RBRACKET,
-                TOKEN_RSTRAIGHTBRACKET,
-                TOKEN_LBRACKET,
-                TOKEN_COMMA,
-                TOKEN_COLON,
-                TOKEN_LCURLYBRACKET,
-                TOKEN_RCURLYBRACKET,
-                TOKEN_EQUAL,
-                TOKEN_GREATERTHAN,
-                TOKEN_LESSTHAN,
-            }
-            or (tokens[0] == TOKEN_KEYWORD and tokens[0].value == "in")
-        ):
-            return []
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        parse_key = cls.parse_key
+        keys = []
+        while ts.type is TOKEN_LSTRAIGHTBRACKET:
+            key = parse_key(ts)
+            keys.append(Node(NODE_KEY, key))
+        if ts.type in _KEYS_FOLLOW:
+            return keys
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_key(cls, tokens):
+    def parse_key(cls, ts):
         """Parses a 'key' symbol and returns an AST.
 
         key → LSTRAIGHTBRACKET expression RSTRAIGHTBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LSTRAIGHTBRACKET:
-            lstraightbracket = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            rstraightbracket = tokens.pop(0)
-            assert rstraightbracket == TOKEN_RSTRAIGHTBRACKET
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_LSTRAIGHTBRACKET:
+            lstraightbracket = ts.advance()
+            expression = cls.parse_expression(ts)
+            rstraightbracket = ts.expect(TOKEN_RSTRAIGHTBRACKET)
             return expression
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_expression(cls, tokens):
+    def parse_expression(cls, ts):
         """Parses an 'expression' node and returns an AST.
 
-        expression → STRING comparison_cont
-        expression → NUMBER comparison_cont
-        expression → LBRACKET expression RBRACKET comparison_cont
-        expression → identity assignment_or_identity_or_function_call comparison_cont
+        Comparisons are parsed in a loop and associate to the left, so 'a < b < c'
+        becomes a comparison of 'a < b' and 'c'.
+
+        expression → operand comparisons
+        * first: STRING, NUMBER, LBRACKET, IDENTIFIER, KEYWORD<fn>, LCURLYBRACKET,
+                 KEYWORD<True>, KEYWORD<False>
+        expression → extern
+        * first: KEYWORD<extern>
+        comparisons → EQUAL comparand comparisons
+        comparisons → GREATERTHAN comparand comparisons
+        comparisons → LESSTHAN comparand comparisons
+        comparisons → ε
+        * follow: ASSIGN, RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON,
+                  RCURLYBRACKET
+        comparand → operand
+        * first: STRING, NUMBER, LBRACKET, IDENTIFIER, KEYWORD<fn>, LCURLYBRACKET,
+                 KEYWORD<True>, KEYWORD<False>
+        comparand → extern
+        * first: KEYWORD<extern>
+        """
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        parse_operand = cls.parse_operand
+        if ts.type is TOKEN_KW_EXTERN:
+            return cls.parse_extern(ts)
+        node = parse_operand(ts)
+        while ts.type in _COMPARISON_OPERATORS:
+            operator = ts.advance()
+            if ts.type is TOKEN_KW_EXTERN:
+                operand = cls.parse_extern(ts)
+            else:
+                operand = parse_operand(ts)
+            node = Node(NODE_COMPARISON, [node, operator, operand])
+        if ts.type in _COMPARISON_FOLLOW:
+            return node
+        raise ParseError(ts.peek())
+
+    @classmethod
+    def parse_operand(cls, ts):
+        """Parses an 'operand' node and returns an AST.
+
+        operand → string
+        * first: STRING
+        operand → number
+        * first: NUMBER
+        operand → bracketed
+        * first: LBRACKET
+        operand → identity_operand
         * first: IDENTIFIER
-        expression → function comparison_cont
+        operand → function
         * first: KEYWORD<fn>
-        expression → dictionary comparison_cont
+        operand → dictionary
         * first: LCURLYBRACKET
-        expression → boolean comparison_cont
+        operand → boolean
         * first: KEYWORD<True>, KEYWORD<False>
-        expression → extern
-        * first: KEYWORD<extern>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_STRING:
-            node = Node(NODE_STRING_LITERAL, tokens.pop(0))
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_NUMBER:
-            node = Node(NODE_NUMBER_LITERAL, tokens.pop(0))
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_IDENTIFIER:
-            identity = cls.parse_identity(tokens)
-            _node = cls.parse_assignment_or_identity_or_function_call(tokens)
-            node_type = _node.type
-            content = [identity.content] + _node.content
-            node = Node(node_type, content)
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_LBRACKET:
-            lbracket = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            rbracket = tokens.pop(0)
-            if rbracket != TOKEN_RBRACKET:
-                raise ParseError(rbracket)
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [expression] + comparison.content)
-            else:
-                return expression
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "fn":
-            node = cls.parse_function(tokens)
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_LCURLYBRACKET:
-            node = cls.parse_dictionary(tokens)
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"True", "False"}:
-            node = cls.parse_boolean(tokens)
-            comparison = cls.parse_comparison_cont(tokens)
-            if comparison:
-                return Node(NODE_COMPARISON, [node] + comparison.content)
-            else:
-                return node
-        elif tokens[0] == TOKEN_KEYWORD and tokens[0].value == "extern":
-            return cls.parse_extern(tokens)
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        handler = _OPERAND_DISPATCH[ts.type]
+        if handler is None:
+            raise ParseError(ts.peek())
+        return handler(ts)
 
     @classmethod
-    def parse_identity_or_function_call(cls, tokens):
-        """Parses an 'identity' or 'function_call' symbol and returns an AST.
+    def parse_string(cls, ts):
+        """Parses a 'string' node and returns an AST.
 
-        identity_or_function_call → function_call_cont
-        * first: LBRACKET
-        identity_or_function_call → identity_cont
-        * follow: ASSIGN, RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON,
-                  RCURLYBRACKET, EQUAL, GREATERTHAN, LESSTHAN
+        string → STRING
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LBRACKET:
-            return cls.parse_function_call_cont(tokens)
-        elif tokens[0] in {
-            TOKEN_ASSIGN,
-            TOKEN_RBRACKET,
-            TOKEN_RSTRAIGHTBRACKET,
-            TOKEN_COMMA,
-            TOKEN_SEMICOLON,
-            TOKEN_COLON,
-            TOKEN_RCURLYBRACKET,
-            TOKEN_EQUAL,
-            TOKEN_GREATERTHAN,
-            TOKEN_LESSTHAN,
-        }:
-            return cls.parse_identity_cont(tokens)
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_STRING:
+            return Node(NODE_STRING_LITERAL, ts.advance())
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_identity_cont(cls, tokens):
-        """Parses an 'identity_cont' symbol and returns an AST.
+    def parse_number(cls, ts):
+        """Parses a 'number' node and returns an AST.
 
-        identity_cont → ε
-        * follow: ASSIGN, RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON,
-                  RCURLYBRACKET, EQUAL, GREATERTHAN, LESSTHAN
+        number → NUMBER
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_ASSIGN,
-            TOKEN_RBRACKET,
-            TOKEN_RSTRAIGHTBRACKET,
-            TOKEN_COMMA,
-            TOKEN_SEMICOLON,
-            TOKEN_COLON,
-            TOKEN_RCURLYBRACKET,
-            TOKEN_EQUAL,
-            TOKEN_GREATERTHAN,
-            TOKEN_LESSTHAN,
-        }:
-            return Node(NODE_IDENTITY, [])
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_NUMBER:
+            return Node(NODE_NUMBER_LITERAL, ts.advance())
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_function_call_cont(cls, tokens):
-        """Parses an 'function_call_cont' symbol and returns an AST.
+    def parse_bracketed(cls, ts):
+        """Parses a 'bracketed' node and returns an AST.
 
-        function_call_cont → LBRACKET args RBRACKET
+        bracketed → LBRACKET expression RBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LBRACKET:
-            lbracket = tokens.pop(0)
-            args = cls.parse_args(tokens)
-            rbracket = tokens.pop(0)
-            if rbracket != TOKEN_RBRACKET:
-                raise ParseError(rbracket)
-            return Node(NODE_FUNCTION_CALL, [args])
-        raise ParseError(tokens[0])
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_LBRACKET:
+            lbracket = ts.advance()
+            expression = cls.parse_expression(ts)
+            rbracket = ts.expect(TOKEN_RBRACKET)
+            return expression
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_args(cls, tokens):
+    def parse_identity_operand(cls, ts):
+        """Parses an 'identity_operand' node and returns an AST.
+
+        The identity and its assignment, identity or function call continuation are
+        parsed in place rather than by separate productions.
+
+        identity_operand → IDENTIFIER keys assignment_or_identity_or_function_call
+        assignment_or_identity_or_function_call → ASSIGN expression
+        assignment_or_identity_or_function_call → LBRACKET args RBRACKET
+        assignment_or_identity_or_function_call → ε
+        * follow: RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON, RCURLYBRACKET,
+                  EQUAL, GREATERTHAN, LESSTHAN
+        """
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        identifier = ts.expect(TOKEN_IDENTIFIER)
+        keys = cls.parse_keys(ts)
+        identity = [identifier, keys]
+        if ts.type is TOKEN_ASSIGN:
+            assign = ts.advance()
+            expression = cls.parse_expression(ts)
+            return Node(NODE_ASSIGNMENT, [identity, expression])
+        elif ts.type is TOKEN_LBRACKET:
+            lbracket = ts.advance()
+            args = cls.parse_args(ts)
+            rbracket = ts.expect(TOKEN_RBRACKET)
+            return Node(NODE_FUNCTION_CALL, [identity, args])
+        elif ts.type in _IDENTITY_FOLLOW:
+            return Node(NODE_IDENTITY, [identity])
+        raise ParseError(ts.peek())
+
+    @classmethod
+    def parse_args(cls, ts):
         """Parses an 'args' node and returns an AST.
 
         args → arg later_args
@@ -572,229 +626,166 @@ class Parser:
                  KEYWORD<True>, KEYWORD<False>
         args → ε
         * follow: RBRACKET
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            arg = cls.parse_arg(tokens)
-            later_args = cls.parse_later_args(tokens)
-            return [arg] + later_args
-        if tokens[0] == TOKEN_RBRACKET:
-            return []
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_later_args(cls, tokens):
-        """Parses an 'later_args' node and returns an AST.
-
+        later_args → COMMA args
         later_args → ε
         * follow: RBRACKET
-        later_args → COMMA args
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_COMMA:
-            comma = tokens.pop(0)
-            args = cls.parse_args(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        parse_arg = cls.parse_arg
+        args = []
+        while ts.type in _EXPRESSION_FIRST:
+            args.append(parse_arg(ts))
+            if ts.type is TOKEN_COMMA:
+                comma = ts.advance()
+            elif ts.type is TOKEN_RBRACKET:
+                return args
+            else:
+                raise ParseError(ts.peek())
+        if ts.type is TOKEN_RBRACKET:
             return args
-        elif tokens[0] == TOKEN_RBRACKET:
-            return []
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_arg(cls, tokens):
+    def parse_arg(cls, ts):
         """Parses an 'arg' node and returns an AST.
 
         later_args → expression
         * first: STRING, NUMBER, LBRACKET, IDENTIFIER, LCURLYBRACKET, KEYWORD<fn>,
                  KEYWORD<True>, KEYWORD<False>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            arg = cls.parse_expression(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type in _EXPRESSION_FIRST:
+            arg = cls.parse_expression(ts)
             return Node(NODE_ARG, arg)
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_function(cls, tokens):
+    def parse_function(cls, ts):
         """Parses a 'function' node and returns an AST.
 
         function → KEYWORD<fn> LBRACKET args RBRACKET block
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value == "fn":
-            keyword = tokens.pop(0)
-            lbracket = tokens.pop(0)
-            if lbracket != TOKEN_LBRACKET:
-                raise ParseError(lbracket)
-            args = cls.parse_args(tokens)
-            rbracket = tokens.pop(0)
-            if rbracket != TOKEN_RBRACKET:
-                raise ParseError(rbracket)
-            block = cls.parse_block(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_KW_FN:
+            keyword = ts.advance()
+            lbracket = ts.expect(TOKEN_LBRACKET)
+            args = cls.parse_args(ts)
+            rbracket = ts.expect(TOKEN_RBRACKET)
+            block = cls.parse_block(ts)
             return Node(NODE_FUNCTION, [args, block])
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_block(cls, tokens):
+    def parse_block(cls, ts):
         """Parses a 'block' node and returns an AST.
 
         block → LCURLYBRACKET statements RCURLYBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LCURLYBRACKET:
-            lcurlybraket = tokens.pop(0)
-            statements = cls.parse_statements(tokens)
-            rcurlybracket = tokens.pop(0)
-            if rcurlybracket != TOKEN_RCURLYBRACKET:
-                raise ParseError(rcurlybracket)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_LCURLYBRACKET:
+            lcurlybraket = ts.advance()
+            statements = cls.parse_statements(ts)
+            rcurlybracket = ts.expect(TOKEN_RCURLYBRACKET)
             return Node(NODE_BLOCK, statements)
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_dictionary(cls, tokens):
+    def parse_dictionary(cls, ts):
         """Parses a 'dictionary' node and returns an AST.
 
         dictionary → LCURLYBRACKET key_values RCURLYBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_LCURLYBRACKET:
-            lcurlybraket = tokens.pop(0)
-            key_values = cls.parse_key_values(tokens)
-            rcurlybracket = tokens.pop(0)
-            if rcurlybracket != TOKEN_RCURLYBRACKET:
-                raise ParseError(rcurlybracket)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type is TOKEN_LCURLYBRACKET:
+            lcurlybraket = ts.advance()
+            key_values = cls.parse_key_values(ts)
+            rcurlybracket = ts.expect(TOKEN_RCURLYBRACKET)
             return Node(NODE_DICTIONARY, key_values)
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_key_values(cls, tokens):
+    def parse_key_values(cls, ts):
         """Parses a 'key_values' node and returns an AST.
 
         key_values → key_value later_key_values
         * first: STRING NUMBER LBRACKET IDENTIFIER KEYWORD<fn> LCURLYBRACKET
         key_values → ε
         * follow: RCURLYBRACKET
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            key_value = cls.parse_key_value(tokens)
-            later_key_values = cls.parse_later_key_values(tokens)
-            return [key_value] + later_key_values
-        elif tokens[0] == TOKEN_RCURLYBRACKET:
-            return []
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_later_key_values(cls, tokens):
-        """Parses a 'later_key_values' node and returns an AST.
-
         later_key_values → COMMA key_values
-        key_values → ε
+        later_key_values → ε
         * follow: RCURLYBRACKET
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_COMMA:
-            comma = tokens.pop(0)
-            key_values = cls.parse_key_values(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        parse_key_value = cls.parse_key_value
+        key_values = []
+        while ts.type in _EXPRESSION_FIRST:
+            key_values.append(parse_key_value(ts))
+            if ts.type is TOKEN_COMMA:
+                comma = ts.advance()
+            elif ts.type is TOKEN_RCURLYBRACKET:
+                return key_values
+            else:
+                raise ParseError(ts.peek())
+        if ts.type is TOKEN_RCURLYBRACKET:
             return key_values
-        elif tokens[0] == TOKEN_RCURLYBRACKET:
-            return []
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_key_value(cls, tokens):
+    def parse_key_value(cls, ts):
         """Parses a 'key_value' node and returns an AST.
 
         key_value → expression TOKEN_COLON expression
         * first: STRING, NUMBER, LBRACKET, IDENTIFIER, KEYWORD<fn>, LCURLYBRACKET,
                  KEYWORD<True>, KEYWORD<False>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] in {
-            TOKEN_STRING,
-            TOKEN_NUMBER,
-            TOKEN_LBRACKET,
-            TOKEN_IDENTIFIER,
-            TOKEN_LCURLYBRACKET,
-        } or (
-            tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"fn", "True", "False"}
-        ):
-            key = cls.parse_expression(tokens)
-            colon = tokens.pop(0)
-            if colon != TOKEN_COLON:
-                raise ParseError(colon)
-            value = cls.parse_expression(tokens)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type in _EXPRESSION_FIRST:
+            key = cls.parse_expression(ts)
+            colon = ts.expect(TOKEN_COLON)
+            value = cls.parse_expression(ts)
             return Node(NODE_KEY_VALUE, [key, value])
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
 
     @classmethod
-    def parse_boolean(cls, tokens):
+    def parse_boolean(cls, ts):
         """Parses a 'boolean' node and returns an AST.
 
         boolean → KEYWORD<True>
         boolean → KEYWORD<False>
         """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_KEYWORD and tokens[0].value in {"True", "False"}:
-            boolean = tokens.pop(0)
+        if ts.debug:
+            logging.debug("%s", ts.peek())
+        if ts.type in _BOOLEANS:
+            boolean = ts.advance()
             return Node(NODE_BOOLEAN, boolean)
-        raise ParseError(tokens[0])
-
-    @classmethod
-    def parse_comparison_cont(cls, tokens):
-        """Parses a 'comparison_cont' node and returns an AST.
-
-        comparison_cont → EQUAL expression
-        comparison_cont → GREATERTHAN expression
-        comparison_cont → LESSTHAN expression
-        comparison_cont → ε
-        * follow: ASSIGN, RBRACKET, RSTRAIGHTBRACKET, COMMA, SEMICOLON, COLON,
-                  RCURLYBRACKET
-        """
-        logging.debug("%s", tokens[0])
-        if tokens[0] == TOKEN_EQUAL:
-            equal = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            return Node(NODE_COMPARISON, [equal, expression])
-        elif tokens[0] == TOKEN_GREATERTHAN:
-            gt = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            return Node(NODE_COMPARISON, [gt, expression])
-        elif tokens[0] == TOKEN_LESSTHAN:
-            lt = tokens.pop(0)
-            expression = cls.parse_expression(tokens)
-            return Node(NODE_COMPARISON, [lt, expression])
-        elif tokens[0] in {
-            TOKEN_ASSIGN,
-            TOKEN_RBRACKET,
-            TOKEN_RSTRAIGHTBRACKET,
-            TOKEN_COMMA,
-            TOKEN_SEMICOLON,
-            TOKEN_COLON,
-            TOKEN_RCURLYBRACKET,
-        }:
-            return []
-        raise ParseError(tokens[0])
+        raise ParseError(ts.peek())
+
+
+_STATEMENT_DISPATCH = _dispatch_table(
+    {
+        **{token_type: Parser.parse_expression for token_type in _EXPRESSION_FIRST},
+        TOKEN_KW_FOR: Parser.parse_for,
+        TOKEN_KW_RETURN: Parser.parse_return,
+        TOKEN_KW_IMPORT: Parser.parse_import,
+        TOKEN_KW_FREE: Parser.parse_free,
+    }
+)
+_OPERAND_DISPATCH = _dispatch_table(
+    {
+        TOKEN_STRING: Parser.parse_string,
+        TOKEN_NUMBER: Parser.parse_number,
+        TOKEN_IDENTIFIER: Parser.parse_identity_operand,
+        TOKEN_LBRACKET: Parser.parse_bracketed,
+        TOKEN_KW_FN: Parser.parse_function,
+        TOKEN_LCURLYBRACKET: Parser.parse_dictionary,
+        TOKEN_KW_TRUE: Parser.parse_boolean,
+        TOKEN_KW_FALSE: Parser.parse_boolean,
+    }
+)
@@ -1,7 +1,9 @@
 import atexit
+import functools
 import logging
 import os
 import readline
+import sys
 
 from uro.generator import Generator
 from uro.ir import IRGenerator
@@ -23,15 +25,29 @@ Toy programming language with self-hosting as its goal.
                                 Written by Joris Hartog
 """
 
+_HEADER_BYTES = f"{HEADER}\n".encode()
+
 HISTORY_FILENAME = "~/.uro_history"
 
 
+@functools.lru_cache(maxsize=256)
+def _tokenize(statement):
+    """Tokenizes a statement, reusing the tokens of recently entered statements.
+
+    A tuple is returned, as the cached tokens are shared between calls."""
+    return tuple(tokenize(statement))
+
+
 class Shell:
     def __init__(self):
         self.prompt = ">>>"
         self.continuation_prompt = "..."
         self.parser = Parser()
-        self._init_history(HISTORY_FILENAME)
+        self.ir_generator = IRGenerator([])
+        self.generator = Generator()
+        self._interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        if self._interactive:
+            self._init_history(HISTORY_FILENAME)
 
     def _init_history(self, filename):
         history_file = os.path.expanduser(filename)
@@ -40,19 +56,35 @@ class Shell:
         except IOError:
             pass
         readline.set_history_length(1000)
+        self._history_start = readline.get_current_history_length()
         atexit.register(self._save_history, history_file)
 
     def _save_history(self, history_file):
-        readline.write_history_file(history_file)
+        """Appends the statements entered in this session to the history file.
+
+        Only the new entries are written; readline truncates the file to the history
+        length afterwards. The whole history is written if the file doesn't exist yet or
+        the readline library can't append."""
+        new_entries = readline.get_current_history_length() - self._history_start
+        if new_entries <= 0:
+            return
+        try:
+            readline.append_history_file(new_entries, history_file)
+        except (AttributeError, FileNotFoundError):
+            readline.write_history_file(history_file)
 
     def run(self):
-        """Read -> Eval -> Print -> Loop, you know the drill."""
-        print(HEADER)
+        """Read -> Eval -> Print -> Loop, you know the drill.
+
+        The header is only shown in an interactive session, so piped output starts
+        with the first result."""
+        if self._interactive:
+            sys.stdout.buffer.write(_HEADER_BYTES)
         continuation = False
         try:
             while True:
                 prompt = self.continuation_prompt if continuation else self.prompt
-                statement = input(f"{prompt} ")
+                statement = self._read_statement(prompt)
                 continuation, result = self.evaluate(statement)
                 if result:
                     print(result)
@@ -60,17 +92,43 @@ class Shell:
             print("Bye!")
             return
 
+    def _read_statement(self, prompt):
+        """Reads the next line of input and raises an EOFError at the end.
+
+        When the input isn't a terminal, e.g. a script piped into the REPL, lines are
+        read straight from stdin without a prompt or readline's line editing and
+        history."""
+        if self._interactive:
+            return input(f"{prompt} ")
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+
     def evaluate(self, statement):
-        """Parses and executes/evaluates a given statement."""
+        """Parses and executes/evaluates a given statement.
+
+        The IR and code generators are shared by all statements of a session, so names
+        defined by earlier statements stay known and the program grows line by line.
+        Only the assembly code added by the statement is returned.
+
+        Lines without any tokens, such as empty or comment-only lines, are skipped and
+        leave a pending continuation as it is. A line which starts a statement without
+        completing it, such as a lone identifier, is buffered without parsing it."""
+        if not statement or statement.isspace():
+            return self.parser.pending, None
         try:
-            tokens = tokenize(statement)
+            tokens = _tokenize(statement)
+            if not tokens:
+                return self.parser.pending, None
+            if self.parser.incomplete(tokens):
+                self.parser.add_tokens(tokens)
+                return True, None
             self.parser.add_tokens(tokens)
-            success = self.parser.parse()
-            assert success  # A ParseError should be raised on a syntax error
-            irg = IRGenerator(self.parser.ast)
-            gen = Generator()
-            gen.compile(irg.ir)
-            return False, gen.asm
+            self.parser.parse()
+            self.ir_generator.ast = self.parser.ast
+            self.generator.compile(self.ir_generator.ir)
+            return False, self.generator.flush_asm()
         except ParseError as e:
             self.parser.reset()
             logging.error(e)
@@ -1,29 +1,81 @@
-TOKEN_WHITESPACE = "token_whitespace"
-TOKEN_COMMENT = "token_comment"
-TOKEN_KEYWORD = "token_keyword"
-TOKEN_NUMBER = "token_number"
-TOKEN_STRING = "token_string"
-TOKEN_IDENTIFIER = "token_identifier"
-TOKEN_LBRACKET = "token_lbracket"
-TOKEN_RBRACKET = "token_rbracket"
-TOKEN_LCURLYBRACKET = "token_lcurlybracket"
-TOKEN_RCURLYBRACKET = "token_rcurlybracket"
-TOKEN_LSTRAIGHTBRACKET = "token_lstraightbracket"
-TOKEN_RSTRAIGHTBRACKET = "token_rstraightbracket"
-TOKEN_PERIOD = "token_period"
-TOKEN_COMMA = "token_comma"
-TOKEN_EQUAL = "token_equal"
-TOKEN_GREATERTHAN = "token_greaterthan"
-TOKEN_LESSTHAN = "token_lessthan"
-TOKEN_ASSIGN = "token_assign"
-TOKEN_COLON = "token_colon"
-TOKEN_SEMICOLON = "token_semicolon"
-TOKEN_MINUS = "token_minus"
-TOKEN_PLUS = "token_plus"
-TOKEN_ASTERISK = "token_asterisk"
-TOKEN_UNKNOWN = "token_unknown"
-TOKEN_EMPTY = "ε"
-TOKEN_EOF = "$"
+import enum
+import itertools
+import re
+
+
+class TokenType(enum.IntEnum):
+    WHITESPACE = enum.auto()
+    COMMENT = enum.auto()
+    KW_FN = enum.auto()
+    KW_FOR = enum.auto()
+    KW_IMPORT = enum.auto()
+    KW_IN = enum.auto()
+    KW_RETURN = enum.auto()
+    KW_TRUE = enum.auto()
+    KW_FALSE = enum.auto()
+    KW_EXTERN = enum.auto()
+    KW_FREE = enum.auto()
+    NUMBER = enum.auto()
+    STRING = enum.auto()
+    IDENTIFIER = enum.auto()
+    LBRACKET = enum.auto()
+    RBRACKET = enum.auto()
+    LCURLYBRACKET = enum.auto()
+    RCURLYBRACKET = enum.auto()
+    LSTRAIGHTBRACKET = enum.auto()
+    RSTRAIGHTBRACKET = enum.auto()
+    PERIOD = enum.auto()
+    COMMA = enum.auto()
+    EQUAL = enum.auto()
+    GREATERTHAN = enum.auto()
+    LESSTHAN = enum.auto()
+    ASSIGN = enum.auto()
+    COLON = enum.auto()
+    SEMICOLON = enum.auto()
+    MINUS = enum.auto()
+    PLUS = enum.auto()
+    ASTERISK = enum.auto()
+    UNKNOWN = enum.auto()
+    EMPTY = enum.auto()
+    EOF = enum.auto()
+
+
+TOKEN_WHITESPACE = TokenType.WHITESPACE
+TOKEN_COMMENT = TokenType.COMMENT
+TOKEN_KW_FN = TokenType.KW_FN
+TOKEN_KW_FOR = TokenType.KW_FOR
+TOKEN_KW_IMPORT = TokenType.KW_IMPORT
+TOKEN_KW_IN = TokenType.KW_IN
+TOKEN_KW_RETURN = TokenType.KW_RETURN
+TOKEN_KW_TRUE = TokenType.KW_TRUE
+TOKEN_KW_FALSE = TokenType.KW_FALSE
+TOKEN_KW_EXTERN = TokenType.KW_EXTERN
+TOKEN_KW_FREE = TokenType.KW_FREE
+TOKEN_NUMBER = TokenType.NUMBER
+TOKEN_STRING = TokenType.STRING
+TOKEN_IDENTIFIER = TokenType.IDENTIFIER
+TOKEN_LBRACKET = TokenType.LBRACKET
+TOKEN_RBRACKET = TokenType.RBRACKET
+TOKEN_LCURLYBRACKET = TokenType.LCURLYBRACKET
+TOKEN_RCURLYBRACKET = TokenType.RCURLYBRACKET
+TOKEN_LSTRAIGHTBRACKET = TokenType.LSTRAIGHTBRACKET
+TOKEN_RSTRAIGHTBRACKET = TokenType.RSTRAIGHTBRACKET
+TOKEN_PERIOD = TokenType.PERIOD
+TOKEN_COMMA = TokenType.COMMA
+TOKEN_EQUAL = TokenType.EQUAL
+TOKEN_GREATERTHAN = TokenType.GREATERTHAN
+TOKEN_LESSTHAN = TokenType.LESSTHAN
+TOKEN_ASSIGN = TokenType.ASSIGN
+TOKEN_COLON = TokenType.COLON
+TOKEN_SEMICOLON = TokenType.SEMICOLON
+TOKEN_MINUS = TokenType.MINUS
+TOKEN_PLUS = TokenType.PLUS
+TOKEN_ASTERISK = TokenType.ASTERISK
+TOKEN_UNKNOWN = TokenType.UNKNOWN
+TOKEN_EMPTY = TokenType.EMPTY
+TOKEN_EOF = TokenType.EOF
+
+TOKEN_COUNT = max(TokenType) + 1
 
 PATTERNS = [
     (r"\s+", TOKEN_WHITESPACE),
@@ -51,20 +103,59 @@ PATTERNS = [
     (r"\*", TOKEN_ASTERISK),
 ]
 
-KEYWORDS = [
-    "fn",
-    "for",
-    "import",
-    "in",
-    "return",
-    "True",
-    "False",
-    "extern",
-    "free",
-]
+PUNCTUATORS = {
+    "(": TOKEN_LBRACKET,
+    ")": TOKEN_RBRACKET,
+    "{": TOKEN_LCURLYBRACKET,
+    "}": TOKEN_RCURLYBRACKET,
+    "[": TOKEN_LSTRAIGHTBRACKET,
+    "]": TOKEN_RSTRAIGHTBRACKET,
+    ".": TOKEN_PERIOD,
+    ",": TOKEN_COMMA,
+    ">": TOKEN_GREATERTHAN,
+    "<": TOKEN_LESSTHAN,
+    ":": TOKEN_COLON,
+    ";": TOKEN_SEMICOLON,
+    "-": TOKEN_MINUS,
+    "+": TOKEN_PLUS,
+    "*": TOKEN_ASTERISK,
+}
+
+KEYWORDS = {
+    "fn": TOKEN_KW_FN,
+    "for": TOKEN_KW_FOR,
+    "import": TOKEN_KW_IMPORT,
+    "in": TOKEN_KW_IN,
+    "return": TOKEN_KW_RETURN,
+    "True": TOKEN_KW_TRUE,
+    "False": TOKEN_KW_FALSE,
+    "extern": TOKEN_KW_EXTERN,
+    "free": TOKEN_KW_FREE,
+}
+
+
+def _compile_patterns(patterns):
+    """Combines all patterns into a single regex with a named group per token type.
+
+    Patterns of the same token type are merged into one group, as group names need to be
+    unique. The order of the patterns is preserved, so the first matching pattern wins.
+    Returns the regex and a list which maps each group's index to its token type.
+    """
+    groups = []
+    group_types = [None]
+    for token_type, rules in itertools.groupby(patterns, key=lambda p: p[1]):
+        rule = "|".join(rule for rule, _ in rules)
+        groups.append(f"(?P<{token_type.name}>{rule})")
+        group_types.append(token_type)
+    return re.compile("|".join(groups), re.MULTILINE), group_types
+
+
+MASTER_RE, MASTER_RE_TYPES = _compile_patterns(PATTERNS)
 
 
 class Token:
+    __slots__ = ("type", "value", "line", "_str")
+
     def __init__(self, token_type, value, line):
         self.type = token_type
         self.value = value
@@ -74,10 +165,11 @@ class Token:
         return str(self)
 
     def __str__(self):
-        return f"<{self.type}('{self.value}') @ line {self.line}>"
-
-    def __eq__(self, other):
-        return self.type == other
-
-    def __hash__(self):
-        return hash(self.type)
+        # Tokens don't change once lexed, so the string is built on first use only.
+        try:
+            return self._str
+        except AttributeError:
+            self._str = (
+                f"<token_{self.type.name.lower()}('{self.value}') @ line {self.line}>"
+            )
+            return self._str